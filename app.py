@@ -9,16 +9,20 @@ from streamlit_autorefresh import st_autorefresh
 from plotly.subplots import make_subplots
 
 
-def load_recent_data(hours=24):
+OHLCV_DATA_PATH = 'data/btcusdt_ohlcv.csv'
+
+
+def load_recent_data(hours=24, data_path=OHLCV_DATA_PATH):
     """
     Load recent data from the last specified hours
     
     :param hours: Number of hours of data to load
+    :param data_path: Path to the OHLCV CSV file
     :return: Filtered DataFrame
     """
     # try:
         # Read CSV with OHLCV data
-    df = pd.read_csv('data/btcusdt_ohlcv.csv')
+    df = pd.read_csv(data_path)
     df['time_window'] = pd.to_datetime(df['time_window'])
     
     # Filter to recent data
@@ -31,25 +35,26 @@ def load_recent_data(hours=24):
     #     return pd.DataFrame()
 
 
-def perform_forecast():
+def perform_forecast(data_path=OHLCV_DATA_PATH):
     """
     Perform multi-metric forecasting
     
+    :param data_path: Path to the OHLCV CSV file
     :return: Forecast data
     """
     try:
-        forecaster = BTCForecaster()
+        forecaster = BTCForecaster(data_path=data_path)
         forecast = forecaster.forecast_ohlcv(periods=2)
         
         if forecast is not None:
             # Prepare forecast data
-            recent_data = load_recent_data()
+            recent_data = load_recent_data(data_path=data_path)
             last_timestamp = recent_data['time_window'].iloc[-1]
             
             forecast_timestamps = pd.date_range(
                 start=last_timestamp, 
                 periods=len(forecast['close_price'])+1,
-                freq='T'  # Minute intervals to match OHLCV data
+                freq='min'  # Minute intervals to match OHLCV data
             )[1:]
             
             forecast_df = pd.DataFrame({
@@ -62,6 +67,104 @@ def perform_forecast():
     except Exception as e:
         st.error(f"Forecasting error: {e}")
         return None
+
+
+def build_figure(recent_data, forecast_df):
+    """
+    Build the candlestick and volume chart of historical and forecast data
+    
+    :param recent_data: Historical OHLCV DataFrame
+    :param forecast_df: Forecast OHLCV DataFrame
+    :return: Plotly figure
+    """
+    # Create a shared x-axis layout
+    fig_combined = make_subplots(
+        rows=2, cols=1, shared_xaxes=True,
+        row_heights=[0.7, 0.3],
+        vertical_spacing=0.02,
+        subplot_titles=("BTC Price Candlestick Chart", "Trading Volume")
+    )
+
+    # Historical prices
+    fig_combined.add_trace(
+        go.Candlestick(
+            x=recent_data['time_window'],
+            open=recent_data['open_price'],
+            high=recent_data['high_price'],
+            low=recent_data['low_price'],
+            close=recent_data['close_price'],
+            name='Historical'
+        ),
+        row=1, col=1
+    )
+
+    # Forecast prices
+    fig_combined.add_trace(
+        go.Candlestick(
+            x=forecast_df['time_window'],
+            open=forecast_df['open_price'],
+            high=forecast_df['high_price'],
+            low=forecast_df['low_price'],
+            close=forecast_df['close_price'],
+            name='Forecasted',
+            increasing_line_color='blue',  # Set a distinct color for forecast
+            decreasing_line_color='red'
+        ),
+        row=1, col=1
+    )
+
+    # Add volume bar chart
+    fig_combined.add_trace(
+        go.Bar(
+            x=recent_data['time_window'],
+            y=recent_data['volume'],
+            name='Historical Volume',
+            marker_color='gray'
+        ),
+        row=2, col=1
+    )
+    fig_combined.add_trace(
+        go.Bar(
+            x=forecast_df['time_window'],
+            y=forecast_df['volume'],
+            name='Forecast Volume',
+            marker_color='blue'
+        ),
+        row=2, col=1
+    )
+
+    # Highlight forecast zone in both subplots
+    forecast_start = forecast_df['time_window'].min()
+    forecast_end = forecast_df['time_window'].max()
+    fig_combined.add_vrect(
+        x0=forecast_start, x1=forecast_end,
+        fillcolor="rgba(0, 255, 0, 0.2)",  # Light green highlight
+        layer="below",
+        line_width=0,
+        row=1, col=1
+    )
+    fig_combined.add_vrect(
+        x0=forecast_start, x1=forecast_end,
+        fillcolor="rgba(0, 255, 0, 0.2)",  # Same highlight for volume
+        layer="below",
+        line_width=0,
+        row=2, col=1
+    )
+
+    # Update layout
+    fig_combined.update_layout(
+        height=700,
+        title='BTC Price Candlestick Chart with Volume and Forecast Highlight',
+        xaxis_title='Time (10 sec window)',
+        yaxis_title='Price (USDT)',
+        xaxis2_title='Time (10 sec window)',
+        yaxis2_title='Volume',
+        xaxis_rangeslider_visible=False
+    )
+
+    return fig_combined
+
+
 def main():
     # Page configuration
     st.set_page_config(layout="wide")
@@ -77,90 +180,7 @@ def main():
         # Combine historical and forecast data
         combined_df = pd.concat([recent_data, forecast_df], ignore_index=True)
 
-        # Create a shared x-axis layout
-        fig_combined = make_subplots(
-            rows=2, cols=1, shared_xaxes=True,
-            row_heights=[0.7, 0.3],
-            vertical_spacing=0.02,
-            subplot_titles=("BTC Price Candlestick Chart", "Trading Volume")
-        )
-
-        # Historical prices
-        fig_combined.add_trace(
-            go.Candlestick(
-                x=recent_data['time_window'],
-                open=recent_data['open_price'],
-                high=recent_data['high_price'],
-                low=recent_data['low_price'],
-                close=recent_data['close_price'],
-                name='Historical'
-            ),
-            row=1, col=1
-        )
-
-        # Forecast prices
-        fig_combined.add_trace(
-            go.Candlestick(
-                x=forecast_df['time_window'],
-                open=forecast_df['open_price'],
-                high=forecast_df['high_price'],
-                low=forecast_df['low_price'],
-                close=forecast_df['close_price'],
-                name='Forecasted',
-                increasing_line_color='blue',  # Set a distinct color for forecast
-                decreasing_line_color='red'
-            ),
-            row=1, col=1
-        )
-
-        # Add volume bar chart
-        fig_combined.add_trace(
-            go.Bar(
-                x=recent_data['time_window'],
-                y=recent_data['volume'],
-                name='Historical Volume',
-                marker_color='gray'
-            ),
-            row=2, col=1
-        )
-        fig_combined.add_trace(
-            go.Bar(
-                x=forecast_df['time_window'],
-                y=forecast_df['volume'],
-                name='Forecast Volume',
-                marker_color='blue'
-            ),
-            row=2, col=1
-        )
-
-        # Highlight forecast zone in both subplots
-        forecast_start = forecast_df['time_window'].min()
-        forecast_end = forecast_df['time_window'].max()
-        fig_combined.add_vrect(
-            x0=forecast_start, x1=forecast_end,
-            fillcolor="rgba(0, 255, 0, 0.2)",  # Light green highlight
-            layer="below",
-            line_width=0,
-            row=1, col=1
-        )
-        fig_combined.add_vrect(
-            x0=forecast_start, x1=forecast_end,
-            fillcolor="rgba(0, 255, 0, 0.2)",  # Same highlight for volume
-            layer="below",
-            line_width=0,
-            row=2, col=1
-        )
-
-        # Update layout
-        fig_combined.update_layout(
-            height=700,
-            title='BTC Price Candlestick Chart with Volume and Forecast Highlight',
-            xaxis_title='Time (10 sec window)',
-            yaxis_title='Price (USDT)',
-            xaxis2_title='Time (10 sec window)',
-            yaxis2_title='Volume',
-            xaxis_rangeslider_visible=False
-        )
+        fig_combined = build_figure(recent_data, forecast_df)
 
         # Plot the combined chart
         st.plotly_chart(fig_combined, use_container_width=True)
@@ -0,0 +1,233 @@
+import os
+import time
+import uuid
+import logging
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+# Time column and de-duplication key of each archived dataset
+TIME_COLUMNS = {'ohlcv': 'time_window', 'trades': 'time'}
+KEY_COLUMNS = {'ohlcv': ['time_window'], 'trades': ['transaction_id']}
+
+PARTITIONING = ds.partitioning(
+    pa.schema([('symbol', pa.string()), ('date', pa.string())]),
+    flavor='hive'
+)
+
+
+def naive_utc_timestamp(value):
+    """Convert a time bound to naive UTC, like the timestamps written by the retriever."""
+    value = pd.Timestamp(value)
+    if value.tzinfo is not None:
+        value = value.tz_convert('UTC').tz_localize(None)
+    return value
+
+
+class ParquetArchive:
+    def __init__(self,
+                 root_path='data/archive',
+                 compression='zstd',
+                 flush_rows=10000,
+                 flush_interval=300,
+                 row_group_size=50000):
+        """
+        Cold storage tier for rows rotated out of the CSV stores
+
+        Rows are buffered in memory for at most flush_interval seconds and written as compressed Parquet files laid
+        out as <root>/<dataset>/symbol=<symbol>/date=<YYYY-MM-DD>/part-*.parquet,
+        with per row group min/max statistics. Reads prune partitions by symbol
+        and date from the path and skip row groups using those statistics.
+
+        :param root_path: Root directory of the archive
+        :param compression: Parquet compression codec
+        :param flush_rows: Buffered rows per dataset before writing a part file
+        :param flush_interval: Seconds rows may stay buffered before writing a part file
+        :param row_group_size: Maximum rows per Parquet row group
+        """
+        self.root_path = root_path
+        self.compression = compression
+        self.flush_rows = flush_rows
+        self.flush_interval = flush_interval
+        self.row_group_size = row_group_size
+        self._buffers = {}
+        # Monotonic time at which each buffer received its oldest rows
+        self._buffered_since = {}
+
+        self.logger = logging.getLogger(__name__)
+
+    def _dataset_path(self, dataset):
+        if dataset not in TIME_COLUMNS:
+            raise ValueError(f"Invalid dataset: {dataset}. Must be one of {list(TIME_COLUMNS)}.")
+        return os.path.join(self.root_path, dataset)
+
+    def _write_part(self, table, partition_dir):
+        """Write a table as a new part file, renamed into place once complete."""
+        os.makedirs(partition_dir, exist_ok=True)
+        name = f"part-{time.time_ns()}-{uuid.uuid4().hex[:8]}.parquet"
+        # Dot-prefixed temp files are ignored by pyarrow dataset discovery
+        tmp_path = os.path.join(partition_dir, f".{name}.tmp")
+        try:
+            pq.write_table(table, tmp_path,
+                           compression=self.compression,
+                           row_group_size=self.row_group_size,
+                           write_statistics=True)
+            os.replace(tmp_path, os.path.join(partition_dir, name))
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def append(self, df, dataset, symbol):
+        """
+        Buffer finalized rows for archival, flushing once flush_rows or flush_interval is reached
+
+        :param df: DataFrame of rows to archive
+        :param dataset: 'ohlcv' or 'trades'
+        :param symbol: Trading pair the rows belong to
+        """
+        self._dataset_path(dataset)
+        if df.empty:
+            return
+        key = (dataset, symbol)
+        self._buffers.setdefault(key, []).append(df)
+        self._buffered_since.setdefault(key, time.monotonic())
+        if sum(len(chunk) for chunk in self._buffers[key]) >= self.flush_rows:
+            self.flush(dataset, symbol)
+        else:
+            self.flush_expired()
+
+    def flush_expired(self):
+        """
+        Write the buffers holding rows for longer than flush_interval
+        """
+        now = time.monotonic()
+        for dataset, symbol in [key for key, since in self._buffered_since.items()
+                                if now - since >= self.flush_interval]:
+            self.flush(dataset, symbol)
+
+    def flush(self, dataset=None, symbol=None):
+        """
+        Write buffered rows to one part file per date partition
+
+        Rows are only dropped from the buffer once their part file is written;
+        on error the unwritten rows stay buffered for the next flush.
+
+        :param dataset: Only flush this dataset (default: all)
+        :param symbol: Only flush this symbol (default: all)
+        """
+        for key in list(self._buffers):
+            buffer_dataset, buffer_symbol = key
+            if dataset is not None and buffer_dataset != dataset:
+                continue
+            if symbol is not None and buffer_symbol != symbol:
+                continue
+
+            time_column = TIME_COLUMNS[buffer_dataset]
+            df = pd.concat(self._buffers[key], ignore_index=True)
+            df[time_column] = pd.to_datetime(df[time_column])
+            # Sorted rows keep row group statistics tight for pruning; the raw
+            # journal re-fetches the same trades on every poll
+            df = df.sort_values(time_column).drop_duplicates(KEY_COLUMNS[buffer_dataset], keep='last')
+            # Keep the deduplicated rows as the buffer, shrinking it as partitions land
+            self._buffers[key] = [df]
+
+            for date, part in df.groupby(df[time_column].dt.strftime('%Y-%m-%d')):
+                partition_dir = os.path.join(self._dataset_path(buffer_dataset),
+                                             f"symbol={buffer_symbol}", f"date={date}")
+                self._write_part(pa.Table.from_pandas(part, preserve_index=False), partition_dir)
+                self._buffers[key] = [self._buffers[key][0].drop(part.index)]
+
+            del self._buffers[key]
+            self._buffered_since.pop(key, None)
+
+            self.logger.info(f"Archived {len(df)} {buffer_dataset} rows for {buffer_symbol}")
+
+    def compact(self, dataset, symbol=None, before=None):
+        """
+        Merge the part files of each finalized date partition into a single file
+
+        :param dataset: 'ohlcv' or 'trades'
+        :param symbol: Only compact this symbol (default: all)
+        :param before: Only compact dates strictly before this one (default: today, UTC)
+        """
+        dataset_path = self._dataset_path(dataset)
+        if not os.path.isdir(dataset_path):
+            return
+        before = naive_utc_timestamp(before if before is not None else pd.Timestamp.now(tz='UTC')).strftime('%Y-%m-%d')
+        time_column = TIME_COLUMNS[dataset]
+
+        for symbol_dir in sorted(os.listdir(dataset_path)):
+            if not symbol_dir.startswith('symbol='):
+                continue
+            if symbol is not None and symbol_dir != f"symbol={symbol}":
+                continue
+            for date_dir in sorted(os.listdir(os.path.join(dataset_path, symbol_dir))):
+                if not date_dir.startswith('date=') or date_dir[len('date='):] >= before:
+                    continue
+                partition_dir = os.path.join(dataset_path, symbol_dir, date_dir)
+                parts = [os.path.join(partition_dir, f) for f in sorted(os.listdir(partition_dir))
+                         if f.startswith('part-') and f.endswith('.parquet')]
+                if len(parts) < 2:
+                    continue
+
+                df = ds.dataset(parts, format='parquet').to_table().to_pandas()
+                df = df.sort_values(time_column).drop_duplicates(KEY_COLUMNS[dataset], keep='last')
+                # The merged file lands before the parts are removed; a crash in
+                # between only leaves duplicates, which reads drop
+                self._write_part(pa.Table.from_pandas(df, preserve_index=False), partition_dir)
+                for part in parts:
+                    os.remove(part)
+                self.logger.info(f"Compacted {len(parts)} files in {partition_dir}")
+
+    def read(self, dataset, symbol=None, start=None, end=None, columns=None):
+        """
+        Read archived rows, pruning partitions and row groups by time range
+
+        :param dataset: 'ohlcv' or 'trades'
+        :param symbol: Trading pair to read (default: all, adds a 'symbol' column)
+        :param start: Inclusive lower bound on the time column
+        :param end: Exclusive upper bound on the time column
+        :param columns: Columns to load (the time column is always included)
+        :return: DataFrame sorted by the time column
+        """
+        dataset_path = self._dataset_path(dataset)
+        time_column = TIME_COLUMNS[dataset]
+        if not os.path.isdir(dataset_path):
+            return pd.DataFrame(columns=[time_column] + [c for c in (columns or []) if c != time_column])
+
+        archive = ds.dataset(dataset_path, format='parquet', partitioning=PARTITIONING)
+
+        expression = None
+        def add_filter(condition):
+            nonlocal expression
+            expression = condition if expression is None else expression & condition
+
+        if symbol is not None:
+            add_filter(ds.field('symbol') == symbol)
+        if start is not None:
+            start = naive_utc_timestamp(start)
+            add_filter(ds.field('date') >= start.strftime('%Y-%m-%d'))
+            add_filter(ds.field(time_column) >= pa.scalar(start.to_datetime64()))
+        if end is not None:
+            end = naive_utc_timestamp(end)
+            add_filter(ds.field('date') <= end.strftime('%Y-%m-%d'))
+            add_filter(ds.field(time_column) < pa.scalar(end.to_datetime64()))
+
+        if columns is None:
+            columns = [name for name in archive.schema.names if name not in ('symbol', 'date')]
+        else:
+            columns = [time_column] + [c for c in columns if c != time_column]
+        if symbol is None and 'symbol' not in columns:
+            columns.append('symbol')
+
+        df = archive.to_table(columns=columns, filter=expression).to_pandas()
+
+        keys = [c for c in KEY_COLUMNS[dataset] if c in df.columns]
+        if symbol is None:
+            keys.append('symbol')
+        df = df.sort_values(time_column, kind='stable')
+        if keys:
+            df = df.drop_duplicates(keys, keep='last')
+        return df.reset_index(drop=True)
@@ -1,4 +1,6 @@
 import os
+import sys
+import signal
 import pandas as pd
 import psutil
 from binance.client import Client
@@ -8,6 +10,10 @@ import logging
 import pathway as pw
 import datetime
 import argparse
+import threading
+
+from src.storage import CsvStore
+from src.archive import ParquetArchive
 
 class RawBinanceData(pw.Schema): # TODO : changer les types 
     transaction_id: int
@@ -22,14 +28,19 @@ class BinanceDataRetriever:
                  memory_threshold_mb=500,  # Memory usage threshold
                  time_window_minutes = 1, # size of candlesticks 
                  raw_data_path='data/raw_btcusdt.csv',
-                 ohlcv_data_path = 'data/btcusdt_ohlcv.csv'):
+                 ohlcv_data_path = 'data/btcusdt_ohlcv.csv',
+                 fsync_every=1, # fsync every N writes (0 = leave it to the OS)
+                 compaction_slack=0, # extra raw rows tolerated before compacting
+                 archive_path=None, # Parquet cold tier for rotated rows (None = discard)
+                 symbol='BTCUSDT',
+                 client=None): # Binance client override (e.g. a fake for load tests)
         # Load environment variables
         load_dotenv()
         
         # Binance API Configuration
         self.API_KEY = os.getenv("BINANCE_API_KEY")
         self.API_SECRET = os.getenv("BINANCE_SECRET")
-        self.client = Client(self.API_KEY, self.API_SECRET)
+        self.client = client if client is not None else Client(self.API_KEY, self.API_SECRET)
         
         # Memory and data management
         self.max_rows = max_rows
@@ -37,6 +48,17 @@ class BinanceDataRetriever:
         self.raw_data_path = raw_data_path
         self.ohlcv_data_path = ohlcv_data_path
         self.time_window_minutes = time_window_minutes
+
+        # Crash-safe storage: atomic snapshots for OHLCV, append journal for raw trades
+        self.store = CsvStore(fsync_every=fsync_every)
+        self.compaction_slack = compaction_slack
+        self._journal_rows = {}
+
+        # Rows rotated out of the CSV stores are archived instead of discarded
+        self.symbol = symbol
+        self.archive = ParquetArchive(root_path=archive_path) if archive_path else None
+        self._last_archive_compaction = None
+        self._compaction_thread = None
         
         # Setup logging
         logging.basicConfig(level=logging.INFO, 
@@ -60,30 +82,56 @@ class BinanceDataRetriever:
 
     def save_to_csv(self, df, data_path):
         """
-        Save DataFrame to CSV with data rotation
+        Append DataFrame to the CSV journal, compacting it once it outgrows max_rows
         
         :param df: DataFrame to save
+        :return: Boolean indicating if the rows were saved
         """
         try:
-            # Ensure directory exists
-            os.makedirs(os.path.dirname(data_path), exist_ok=True)
-            
-            # Check if file exists and manage row count
-            if os.path.exists(data_path):
-                existing_df = pd.read_csv(data_path)
-                
-                # If exceeding max rows, keep only recent data
-                if len(existing_df) + len(df) > self.max_rows:
-                    existing_df = existing_df.tail(self.max_rows - len(df))
-                    existing_df.to_csv(data_path, index=False)
-                    self.logger.info(f"Rotated data, kept {len(existing_df)} rows")
-            
+            # Row count is tracked in memory so appends never re-read the file;
+            # the first touch also repairs a torn line from a previous crash
+            if data_path not in self._journal_rows:
+                self._journal_rows[data_path] = self.store.recover_journal(data_path)
 
-            df.to_csv(data_path, mode='a', header=not os.path.exists(data_path), index=False) 
+            self.store.append(df, data_path)
+            self._journal_rows[data_path] += len(df)
             self.logger.info(f"Saved {len(df)} new rows")
+
+            if self._journal_rows[data_path] > self.max_rows + self.compaction_slack:
+                self.compact_csv(data_path)
+            return True
             
         except Exception as e:
             self.logger.error(f"Error saving to CSV: {e}")
+            return False
+
+    def archive_rows(self, df, dataset):
+        """
+        Hand rotated rows to the archive without letting its errors reach the hot path
+        
+        :param df: DataFrame of rotated rows
+        :param dataset: 'ohlcv' or 'trades'
+        """
+        if self.archive is None or df.empty:
+            return
+        try:
+            self.archive.append(df, dataset, self.symbol)
+        except Exception as e:
+            self.logger.error(f"Error archiving {dataset} rows: {e}")
+
+    def compact_csv(self, data_path):
+        """
+        Rewrite the CSV journal atomically, keeping only the most recent max_rows
+        
+        :param data_path: Path to the CSV file
+        """
+        existing_df = pd.read_csv(data_path)
+        rotated_df = existing_df.head(max(len(existing_df) - self.max_rows, 0))
+        existing_df = existing_df.tail(self.max_rows)
+        self.store.replace(existing_df, data_path)
+        self._journal_rows[data_path] = len(existing_df)
+        self.logger.info(f"Rotated data, kept {len(existing_df)} rows")
+        self.archive_rows(rotated_df, 'trades')
 
     def save_ohlcv_to_csv(self, df, data_path):
         """
@@ -119,13 +167,16 @@ class BinanceDataRetriever:
             combined_df = df
 
         # Enforce max rows if necessary
+        rotated_df = combined_df.head(max(len(combined_df) - self.max_rows, 0))
         if len(combined_df) > self.max_rows:
             combined_df = combined_df.tail(self.max_rows)
             self.logger.info(f"Rotated data, kept last {self.max_rows} rows")
 
-        # Save updated data to CSV
-        combined_df.to_csv(data_path, index=False)
+        # Atomically swap in the new snapshot so readers never see a partial file
+        self.store.replace(combined_df, data_path)
         self.logger.info(f"Saved {len(df)} rows to {data_path}")
+        # The snapshot comes first: the cold tier must never hold up fresh candles
+        self.archive_rows(rotated_df, 'ohlcv')
 
 
     def get_btcusdt_data(self, limit, time_scale="min", number=1):
@@ -137,7 +188,7 @@ class BinanceDataRetriever:
             if number <= 0:
                 raise ValueError(f"Invalid number: {number}. Must be a positive integer.")
         
-            trades = self.client.get_recent_trades(symbol='BTCUSDT', limit=limit)
+            trades = self.client.get_recent_trades(symbol=self.symbol, limit=limit)
             df = pd.DataFrame(trades)
 
             # Data transformation
@@ -198,31 +249,80 @@ class BinanceDataRetriever:
             self.logger.error(f"Error retrieving Binance data: {e}")
             return pd.DataFrame()
 
+    def maintain_archive(self):
+        """
+        Write archive buffers that are due and start compacting past days' partitions once per day
+        """
+        if self.archive is None:
+            return
+        # Partitions are dated in UTC, like the trade timestamps
+        today = datetime.datetime.now(datetime.timezone.utc).date()
+        try:
+            self.archive.flush_expired()
+            if self._last_archive_compaction == today:
+                return
+            if self._compaction_thread is not None and self._compaction_thread.is_alive():
+                return
+            # Buffered rows may still belong to past days, write them first
+            self.archive.flush(symbol=self.symbol)
+        except Exception as e:
+            self.logger.error(f"Error maintaining archive: {e}")
+            return
+
+        # Compaction rewrites whole days of rows, so it runs off the retrieval loop.
+        # It only touches past days and removes just the parts it merged, so
+        # flushes running meanwhile are safe.
+        self._last_archive_compaction = today
+        self._compaction_thread = threading.Thread(target=self.compact_archive, daemon=True)
+        self._compaction_thread.start()
+
+    def compact_archive(self):
+        """
+        Compact the archive partitions of past days for this symbol
+        """
+        try:
+            for dataset in ('ohlcv', 'trades'):
+                self.archive.compact(dataset, symbol=self.symbol)
+        except Exception as e:
+            self.logger.error(f"Error compacting archive: {e}")
+
     def run_data_pipeline(self, frequency, limit, time_window_scale, time_window_size):
         """
         Continuous data retrieval and storage with memory checks
         
         :param interval: Seconds between data retrievals
         """
-        while True:
-            # Check memory before processing
-            if self.check_memory_usage():
-                # Implement your memory management strategy
-                # For example, you might want to restart the process or clear some data
-                self.logger.warning("High memory usage detected. Consider restarting.")
-            
-            # Retrieve and save data
-            self.get_btcusdt_data(limit, time_scale=time_window_scale, number=time_window_size)
-            # Wait before next iteration
-            time.sleep(frequency)
+        try:
+            while True:
+                # Check memory before processing
+                if self.check_memory_usage():
+                    # Implement your memory management strategy
+                    # For example, you might want to restart the process or clear some data
+                    self.logger.warning("High memory usage detected. Consider restarting.")
+                
+                # Retrieve and save data
+                self.get_btcusdt_data(limit, time_scale=time_window_scale, number=time_window_size)
+                self.maintain_archive()
+                # Wait before next iteration
+                time.sleep(frequency)
+        finally:
+            # Persist rows still buffered for the archive on shutdown
+            if self.archive is not None:
+                self.archive.flush()
 
 def main():
+    # Exit through run_data_pipeline's cleanup so buffered archive rows are written
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+
     retriever = BinanceDataRetriever(
         max_rows=5000,  # Maximum rows to keep in CSV
         memory_threshold_mb=500,  # Memory usage threshold
         time_window_minutes = 1, # size of candlesticks 
         raw_data_path='data/raw_btcusdt.csv',
-        ohlcv_data_path = 'data/btcusdt_ohlcv.csv')
+        ohlcv_data_path = 'data/btcusdt_ohlcv.csv',
+        fsync_every=20, # ~1s of writes at 0.05s frequency
+        compaction_slack=500, # compact the raw journal every ~10 retrievals
+        archive_path='data/archive') # keep rotated history as Parquet
 
     retriever.run_data_pipeline(
         frequency=0.05, 
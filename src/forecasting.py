@@ -1,21 +1,30 @@
+import os
 import pandas as pd
 import numpy as np
 from statsmodels.tsa.arima.model import ARIMA
 import logging
 from datetime import timedelta
 
+from src.archive import ParquetArchive, naive_utc_timestamp
+
 class BTCForecaster:
     def __init__(self, 
                  data_path='data/btcusdt_ohlcv.csv', 
-                 chunk_size=5000):
+                 chunk_size=5000,
+                 archive_path=None,
+                 symbol='BTCUSDT'):
         """
         Initialize forecaster with memory-efficient data loading
         
         :param data_path: Path to OHLCV CSV file
         :param chunk_size: Number of rows to load at a time
+        :param archive_path: Root of the Parquet archive holding older OHLCV rows
+        :param symbol: Trading pair to read from the archive
         """
         self.data_path = data_path
         self.chunk_size = chunk_size
+        self.archive = ParquetArchive(root_path=archive_path) if archive_path else None
+        self.symbol = symbol
         self.historical_data = None
         self.forecast = None
         
@@ -52,13 +61,19 @@ class BTCForecaster:
         return future_windows
 
 
-    def load_data(self, use_recent_chunks=True):
+    def load_data(self, use_recent_chunks=True, start=None, end=None, columns=None):
         """
         Load historical OHLCV data from CSV with memory efficiency
         
         :param use_recent_chunks: If True, load only most recent chunks
+        :param start: If start or end is set, load the [start, end) range from the archive and CSV instead
+        :param end: Exclusive upper bound of the range
+        :param columns: Columns to load in range mode (default: all)
         :return: DataFrame with historical data
         """
+        if start is not None or end is not None:
+            return self.load_range(start=start, end=end, columns=columns)
+
         try:
             # Read data in chunks
             chunks = pd.read_csv(self.data_path, chunksize=self.chunk_size)
@@ -87,7 +102,52 @@ class BTCForecaster:
             self.logger.error(f"Error loading data: {e}")
             return None
 
-    import numpy as np
+    def load_range(self, start=None, end=None, columns=None):
+        """
+        Load OHLCV data over a time range, merging the Parquet archive with the CSV
+
+        Only archive partitions and row groups overlapping the range are read,
+        so long histories can be scanned for backtests without loading them whole.
+        
+        :param start: Inclusive lower bound on time_window (default: open ended)
+        :param end: Exclusive upper bound on time_window (default: open ended)
+        :param columns: Columns to load (default: all)
+        :return: DataFrame with historical data
+        """
+        try:
+            frames = []
+            if self.archive is not None:
+                frames.append(self.archive.read('ohlcv', symbol=self.symbol,
+                                                start=start, end=end, columns=columns))
+
+            usecols = None if columns is None else ['time_window'] + [c for c in columns if c != 'time_window']
+            if os.path.exists(self.data_path):
+                recent = pd.read_csv(self.data_path, usecols=usecols)
+            else:
+                # Backtests may run against the archive alone
+                recent = pd.DataFrame(columns=usecols or ['time_window'])
+            recent['time_window'] = pd.to_datetime(recent['time_window'])
+            # Bounds are normalized to naive UTC the same way the archive does
+            in_range = pd.Series(True, index=recent.index)
+            if start is not None:
+                in_range &= recent['time_window'] >= naive_utc_timestamp(start)
+            if end is not None:
+                in_range &= recent['time_window'] < naive_utc_timestamp(end)
+            frames.append(recent[in_range])
+
+            # CSV rows are the freshest version of a window also found in the archive
+            frames = [frame for frame in frames if not frame.empty] or frames[-1:]
+            self.historical_data = (pd.concat(frames, ignore_index=True)
+                                    .drop_duplicates('time_window', keep='last')
+                                    .sort_values('time_window')
+                                    .set_index('time_window'))
+
+            self.logger.info(f"Loaded {len(self.historical_data)} rows of data")
+            return self.historical_data
+
+        except Exception as e:
+            self.logger.error(f"Error loading data: {e}")
+            return None
 
     def forecast_price(self, periods=5, forecast_column='close_price', use_recent_data=True):
         """
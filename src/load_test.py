@@ -0,0 +1,634 @@
+import os
+import re
+import sys
+import time
+import zlib
+import queue
+import shutil
+import logging
+import argparse
+import tempfile
+import threading
+import multiprocessing
+from collections import Counter, deque
+import numpy as np
+import pandas as pd
+import psutil
+
+from src.storage import CsvStore
+
+STAGES = ['fetch', 'raw_write', 'candle_write', 'ingest',
+          'load', 'forecast', 'render', 'session', 'end_to_end']
+# Errors in these stages mean trades were lost, which fails the run
+INGEST_STAGES = ['fetch', 'raw_write', 'candle_write', 'ingest']
+# Errors in these stages fail the run once they exceed --max-error-rate
+DASHBOARD_STAGES = ['load', 'forecast', 'render', 'session']
+PERCENTILES = [50, 95, 99]
+PROCESSES = ['ingest', 'dashboard']
+START_PRICE = 60000.0
+
+
+class FakeBinanceClient:
+    def __init__(self, trades_per_sec=20, start_price=START_PRICE, seed=0):
+        """
+        Local stand-in for binance.client.Client producing trades at a fixed rate
+
+        Trades are generated lazily on each call for the time elapsed since the
+        previous one, as a random walk on price, and carry the wall clock time
+        they were generated at. Each symbol has its own lock and random state,
+        so concurrent symbols never wait on each other.
+
+        :param trades_per_sec: Trades generated per second and per symbol
+        :param start_price: Initial price of every symbol
+        :param seed: Random seed
+        """
+        self.trades_per_sec = trades_per_sec
+        self.start_price = start_price
+        self.seed = seed
+        self._symbols = {}
+        self._symbols_lock = threading.Lock()
+        # Wall clock time (ms) of the newest trade returned, per symbol
+        self.newest_served = {}
+
+    def _state(self, symbol):
+        with self._symbols_lock:
+            if symbol not in self._symbols:
+                self._symbols[symbol] = {
+                    'lock': threading.Lock(),
+                    'rng': np.random.default_rng([self.seed, zlib.crc32(symbol.encode())]),
+                    'price': self.start_price, 'next_id': 0, 'last_time': None,
+                    'carry': 0.0, 'trades': deque(maxlen=1000)}
+            return self._symbols[symbol]
+
+    def get_recent_trades(self, symbol, limit=500):
+        """Return the last `limit` trades of a symbol in Binance's response format."""
+        state = self._state(symbol)
+        with state['lock']:
+            now = time.time()
+            rng = state['rng']
+            if state['last_time'] is None:
+                # Backfill so the first call returns a full page, like the real API
+                state['last_time'] = now - limit / self.trades_per_sec
+
+            # Carry fractional trades over so low rates still produce trades
+            expected = (now - state['last_time']) * self.trades_per_sec + state['carry']
+            count = int(expected)
+            state['carry'] = expected - count
+            state['last_time'] = now
+
+            for offset in np.linspace(now - count / max(self.trades_per_sec, 1), now, count):
+                state['price'] *= 1 + rng.normal(0, 1e-4)
+                state['trades'].append({
+                    'id': state['next_id'],
+                    'price': f"{state['price']:.2f}",
+                    'qty': f"{rng.exponential(0.01):.5f}",
+                    'time': int(offset * 1000),
+                    'isBuyerMaker': bool(rng.integers(2)),
+                    'isBestMatch': True,
+                })
+                state['next_id'] += 1
+
+            trades = list(state['trades'])[-limit:]
+            if trades:
+                self.newest_served[symbol] = trades[-1]['time']
+            return trades
+
+
+class LatencyRecorder:
+    def __init__(self):
+        """Thread-safe collection of per-stage latency samples, in seconds."""
+        self._samples = {stage: [] for stage in STAGES}
+        self._errors = {}
+        self._causes = {}
+        self._lock = threading.Lock()
+
+    def record(self, stage, seconds):
+        with self._lock:
+            self._samples[stage].append(seconds)
+
+    def error(self, stage, cause=None):
+        with self._lock:
+            self._errors[stage] = self._errors.get(stage, 0) + 1
+            if cause is not None:
+                self._causes.setdefault(stage, Counter())[cause] += 1
+
+    def timed(self, stage, func):
+        """
+        Wrap func so each call is recorded under stage, and each exception as an error
+        """
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                result = func(*args, **kwargs)
+            except Exception as e:
+                self.error(stage, cause=f"{type(e).__name__}: {e}")
+                raise
+            finally:
+                self.record(stage, time.perf_counter() - start)
+            return result
+        return wrapper
+
+    def export(self):
+        """Return samples, errors and error causes as plain dicts, to send them across processes."""
+        with self._lock:
+            return ({stage: list(samples) for stage, samples in self._samples.items()},
+                    dict(self._errors),
+                    {stage: dict(causes) for stage, causes in self._causes.items()})
+
+    def merge(self, samples, errors, causes):
+        """Add samples, errors and error causes exported by another recorder."""
+        with self._lock:
+            for stage, stage_samples in samples.items():
+                self._samples[stage].extend(stage_samples)
+            for stage, count in errors.items():
+                self._errors[stage] = self._errors.get(stage, 0) + count
+            for stage, stage_causes in causes.items():
+                self._causes.setdefault(stage, Counter()).update(stage_causes)
+
+    def error_causes(self, top=3):
+        """
+        Most frequent error causes per stage
+
+        :param top: Number of causes kept per stage
+        :return: Dict of stage to a list of (cause, count)
+        """
+        with self._lock:
+            return {stage: causes.most_common(top) for stage, causes in self._causes.items()}
+
+    def summary(self):
+        """
+        Summarize latencies per stage
+
+        :return: DataFrame indexed by stage with count, errors and percentiles in ms
+        """
+        rows = {}
+        with self._lock:
+            for stage, samples in self._samples.items():
+                row = {'count': len(samples), 'errors': self._errors.get(stage, 0)}
+                for p in PERCENTILES:
+                    row[f'p{p}'] = np.percentile(samples, p) * 1000 if samples else np.nan
+                row['max'] = max(samples) * 1000 if samples else np.nan
+                rows[stage] = row
+        return pd.DataFrame.from_dict(rows, orient='index')
+
+
+class ResourceSampler(threading.Thread):
+    def __init__(self, interval=0.5):
+        """
+        Background sampler of this process' CPU usage and resident memory
+
+        :param interval: Seconds between samples
+        """
+        super().__init__(daemon=True)
+        self.interval = interval
+        self.process = psutil.Process()
+        self.cpu_percent = []
+        self.rss_mb = []
+        self._stop_event = threading.Event()
+
+    def run(self):
+        self.process.cpu_percent(interval=None)
+        while not self._stop_event.wait(self.interval):
+            self.cpu_percent.append(self.process.cpu_percent(interval=None))
+            self.rss_mb.append(self.process.memory_info().rss / 1024 / 1024)
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+    def summary(self):
+        return {
+            'cpu_mean_percent': float(np.mean(self.cpu_percent)) if self.cpu_percent else 0.0,
+            'cpu_max_percent': float(np.max(self.cpu_percent)) if self.cpu_percent else 0.0,
+            'rss_max_mb': float(np.max(self.rss_mb)) if self.rss_mb else 0.0,
+        }
+
+
+class ErrorCapture(logging.Handler):
+    def __init__(self):
+        """
+        Keep the last error each thread reported, so swallowed failures get a cause
+
+        Attach it to a logger as a handler, or use report() in place of st.error,
+        which does nothing outside a Streamlit run.
+        """
+        super().__init__(level=logging.ERROR)
+        self._local = threading.local()
+
+    def emit(self, record):
+        self._local.message = record.getMessage()
+
+    def report(self, message, *args, **kwargs):
+        self._local.message = str(message)
+
+    def pop(self):
+        """Return and clear the last error reported by the calling thread."""
+        message = getattr(self._local, 'message', None)
+        self._local.message = None
+        return message
+
+
+def data_paths(workdir, symbol):
+    """Return the (raw, OHLCV) CSV paths of a symbol under workdir."""
+    directory = os.path.join(workdir, symbol.lower())
+    return (os.path.join(directory, 'raw.csv'), os.path.join(directory, 'ohlcv.csv'))
+
+
+def seed_history(config, symbol, store, rng):
+    """
+    Write synthetic candles up to the window the first fetch backfills into
+
+    Seeding from the ingestion process, right before it starts, leaves no gap
+    between the synthetic history and the first trades however long the
+    process took to start; forecasts need a regular time index.
+
+    :param config: Dict of LoadTest settings
+    :param symbol: Trading pair to seed
+    :param store: CsvStore writing the OHLCV file
+    :param rng: Random generator of the synthetic prices
+    """
+    if config['seed_candles'] <= 0:
+        return
+    freq = f"{config['time_window_size']}{config['time_window_scale'][0]}"
+    # The window holding the oldest backfilled trade is seeded too; the retriever merges the overlap
+    backfill_start = pd.Timestamp.now(tz='UTC').tz_localize(None) - pd.Timedelta(
+        seconds=config['limit'] / config['trades_per_sec'])
+    windows = pd.date_range(end=backfill_start.floor(freq), periods=config['seed_candles'], freq=freq)
+    close = START_PRICE * np.cumprod(1 + rng.normal(0, 1e-3, len(windows)))
+    seed = pd.DataFrame({
+        'time_window': windows,
+        'open_price': np.r_[START_PRICE, close[:-1]],
+        'high_price': close * 1.0005,
+        'low_price': close * 0.9995,
+        'close_price': close,
+        'volume': rng.exponential(0.5, len(windows)),
+    })
+    store.replace(seed, data_paths(config['workdir'], symbol)[1])
+
+
+def run_ingestion(config, published, ready_event, stop_event, results):
+    """
+    Entry point of the ingestion process, standing in for `python -m src.data_retrieval`
+
+    Seeds each symbol's history, then runs one retriever thread per symbol
+    against a FakeBinanceClient until stop_event is set, then puts its latency samples and resource usage on
+    results.
+
+    :param config: Dict of LoadTest settings
+    :param published: Shared array of the newest persisted trade time per symbol
+    :param ready_event: Set once ingestion has started
+    :param stop_event: Set by the dashboard process to end the run
+    :param results: Queue receiving (samples, errors, causes, resources)
+    """
+    # Keep per-write INFO logs of the pipeline out of the measurements
+    logging.basicConfig(level=logging.WARNING, format='%(asctime)s - %(levelname)s: %(message)s')
+    from src.data_retrieval import BinanceDataRetriever
+    # The retriever logs the errors it swallows; keep them as causes
+    errors = ErrorCapture()
+    logging.getLogger('src.data_retrieval').addHandler(errors)
+
+    recorder = LatencyRecorder()
+    sampler = ResourceSampler()
+    client = FakeBinanceClient(trades_per_sec=config['trades_per_sec'], seed=config['seed'])
+    # Instance attributes shadow the methods the pipeline calls
+    client.get_recent_trades = recorder.timed('fetch', client.get_recent_trades)
+
+    def ingest(index, symbol):
+        raw_data_path, ohlcv_data_path = data_paths(config['workdir'], symbol)
+        retriever = BinanceDataRetriever(max_rows=config['max_rows'],
+                                         raw_data_path=raw_data_path,
+                                         ohlcv_data_path=ohlcv_data_path,
+                                         fsync_every=config['fsync_every'],
+                                         symbol=symbol,
+                                         client=client)
+        timed_save_to_csv = recorder.timed('raw_write', retriever.save_to_csv)
+
+        def save_to_csv(df, data_path):
+            saved = timed_save_to_csv(df, data_path)
+            if saved is False:
+                recorder.error('raw_write', cause=errors.pop())
+            return saved
+
+        retriever.save_to_csv = save_to_csv
+        retriever.save_ohlcv_to_csv = recorder.timed('candle_write', retriever.save_ohlcv_to_csv)
+
+        while not stop_event.is_set():
+            start = time.perf_counter()
+            # get_btcusdt_data returns None on success and an empty DataFrame on error
+            result = retriever.get_btcusdt_data(config['limit'], time_scale=config['time_window_scale'],
+                                                number=config['time_window_size'])
+            recorder.record('ingest', time.perf_counter() - start)
+            if result is not None:
+                recorder.error('ingest', cause=errors.pop())
+            else:
+                # Only this thread fetches the symbol, so the newest served trade is now on disk
+                newest_served = client.newest_served.get(symbol)
+                if newest_served is not None:
+                    with published.get_lock():
+                        published[index] = newest_served / 1000
+            stop_event.wait(max(config['frequency'] - (time.perf_counter() - start), 0))
+
+    store = CsvStore(fsync_every=config['fsync_every'])
+    rng = np.random.default_rng(config['seed'])
+    for symbol in config['symbols']:
+        seed_history(config, symbol, store, rng)
+
+    sampler.start()
+    threads = [threading.Thread(target=ingest, args=(index, symbol), daemon=True)
+               for index, symbol in enumerate(config['symbols'])]
+    for thread in threads:
+        thread.start()
+    ready_event.set()
+
+    for thread in threads:
+        thread.join()
+    sampler.stop()
+    results.put(recorder.export() + (sampler.summary(),))
+
+
+class LoadTest:
+    def __init__(self,
+                 symbols=1,
+                 trades_per_sec=20,
+                 sessions=1,
+                 duration=60,
+                 warmup=5,
+                 frequency=0.05,
+                 limit=50,
+                 time_window_scale='sec',
+                 time_window_size=10,
+                 refresh_interval=1.0,
+                 seed_candles=200,
+                 max_rows=5000,
+                 fsync_every=1,
+                 workdir=None,
+                 seed=0):
+        """
+        End-to-end load test of the trade -> candle -> forecast -> render path
+
+        Like `python -m src.data_retrieval` and `streamlit run` in production,
+        ingestion runs in its own process (one retriever thread per symbol
+        polling a FakeBinanceClient), while N dashboard sessions run
+        app.load_recent_data, app.perform_forecast and app.build_figure in
+        threads of this process, as Streamlit script runs do. CPU and RSS are
+        sampled per process. end_to_end is the age of the newest trade
+        persisted before a session started loading, measured once its chart
+        is built.
+
+        :param symbols: Number of symbols ingested concurrently
+        :param trades_per_sec: Trades per second generated for each symbol
+        :param sessions: Number of concurrent dashboard sessions
+        :param duration: Seconds of measured load, after warmup
+        :param warmup: Seconds of ingestion before sessions start
+        :param frequency: Seconds between retrievals of a symbol
+        :param limit: Trades fetched per retrieval
+        :param time_window_scale: Candle time scale ('sec', 'min' or 'hour')
+        :param time_window_size: Candle size in time_window_scale units
+        :param refresh_interval: Seconds between runs of a session (st_autorefresh)
+        :param seed_candles: Synthetic candles written per symbol before starting
+        :param max_rows: Retention of the CSV stores
+        :param fsync_every: fsync batching of the CSV stores
+        :param workdir: Directory for the data files (default: a temporary one, removed afterwards)
+        :param seed: Random seed of the synthetic data
+        """
+        self.symbols = ['BTCUSDT'] + [f'SYM{i}USDT' for i in range(1, symbols)]
+        self.sessions = sessions
+        self.duration = duration
+        self.warmup = warmup
+        self.refresh_interval = refresh_interval
+        self.cleanup_workdir = workdir is None
+        self.workdir = workdir or tempfile.mkdtemp(prefix='load_test_')
+        self.config = {
+            'symbols': self.symbols, 'trades_per_sec': trades_per_sec, 'frequency': frequency,
+            'limit': limit, 'time_window_scale': time_window_scale,
+            'time_window_size': time_window_size, 'max_rows': max_rows,
+            'fsync_every': fsync_every, 'workdir': self.workdir, 'seed': seed,
+            'seed_candles': seed_candles,
+        }
+
+        self.recorder = LatencyRecorder()
+
+        # Spawn gives the ingestion process a fresh interpreter, like a separate command
+        self._context = multiprocessing.get_context('spawn')
+        self._stop_event = self._context.Event()
+        # Wall clock time of the newest trade persisted, per symbol (nan until the first one)
+        self._published = self._context.Array('d', [np.nan] * len(self.symbols))
+
+        self.logger = logging.getLogger(__name__)
+        if limit < trades_per_sec * frequency:
+            self.logger.warning(f"limit={limit} is below the {trades_per_sec * frequency:.0f} trades "
+                                f"generated per retrieval, trades will be dropped")
+
+    def _session(self, app, index):
+        symbol_index = index % len(self.symbols)
+        data_path = data_paths(self.workdir, self.symbols[symbol_index])[1]
+        load = self.recorder.timed('load', app.load_recent_data)
+        forecast = self.recorder.timed('forecast', app.perform_forecast)
+        render = self.recorder.timed('render', app.build_figure)
+
+        while not self._stop_event.is_set():
+            start = time.perf_counter()
+            with self._published.get_lock():
+                newest_trade = self._published[symbol_index]
+            self._dashboard_errors.pop()
+            try:
+                recent_data = load(data_path=data_path)
+                if recent_data.empty:
+                    self.recorder.error('load', cause="No recent data")
+                    raise RuntimeError("No recent data")
+                forecast_df = forecast(data_path=data_path)
+                if forecast_df is None:
+                    # perform_forecast reports its failures through st.error
+                    cause = self._dashboard_errors.pop() or "No forecast"
+                    self.recorder.error('forecast', cause=cause)
+                    raise RuntimeError(cause)
+                render(recent_data, forecast_df)
+                if not np.isnan(newest_trade):
+                    self.recorder.record('end_to_end', time.time() - newest_trade)
+            except Exception as e:
+                self.logger.warning(f"Session {index} failed: {e}")
+                self.recorder.error('session', cause=str(e))
+            elapsed = time.perf_counter() - start
+            self.recorder.record('session', elapsed)
+            self._stop_event.wait(max(self.refresh_interval - elapsed, 0))
+
+    def run(self):
+        """
+        Run the load test
+
+        :return: Tuple of (latency summary DataFrame, dict of resource summaries per process)
+        """
+        try:
+            return self._run()
+        finally:
+            if self.cleanup_workdir:
+                shutil.rmtree(self.workdir, ignore_errors=True)
+
+    def _run(self):
+        # Imported here, before any measurement, so the spawned ingestion process,
+        # which re-imports this module, does not load the dashboard stack
+        import app
+        # st.error does nothing outside a Streamlit run; capture what it reports
+        self._dashboard_errors = ErrorCapture()
+        streamlit_error = app.st.error
+        app.st.error = self._dashboard_errors.report
+
+        ready_event = self._context.Event()
+        results = self._context.Queue()
+        ingestion = self._context.Process(
+            target=run_ingestion, name='ingest', daemon=True,
+            args=(self.config, self._published, ready_event, self._stop_event, results))
+        ingestion.start()
+
+        sampler = ResourceSampler()
+        sessions = [threading.Thread(target=self._session, args=(app, i), daemon=True)
+                    for i in range(self.sessions)]
+        try:
+            while not ready_event.wait(0.5):
+                if not ingestion.is_alive():
+                    raise RuntimeError(f"Ingestion process exited with code {ingestion.exitcode}")
+            time.sleep(self.warmup)
+
+            sampler.start()
+            for thread in sessions:
+                thread.start()
+            time.sleep(self.duration)
+        finally:
+            self._stop_event.set()
+            for thread in sessions:
+                if thread.is_alive():
+                    thread.join()
+            if sampler.is_alive():
+                sampler.stop()
+            app.st.error = streamlit_error
+
+        resources = {'dashboard': sampler.summary()}
+        try:
+            # Read before joining: a child blocked on a full queue never exits
+            samples, errors, causes, resources['ingest'] = results.get(timeout=60)
+            self.recorder.merge(samples, errors, causes)
+        except queue.Empty:
+            raise RuntimeError(f"Ingestion process returned no results (exit code {ingestion.exitcode})")
+        finally:
+            ingestion.join(timeout=10)
+            if ingestion.is_alive():
+                ingestion.terminate()
+        return self.recorder.summary(), resources
+
+
+def parse_budget(value):
+    """Parse a STAGE:STAT=MS budget, e.g. 'end_to_end:p99=2000'."""
+    stats = [f'p{p}' for p in PERCENTILES] + ['max']
+    match = re.fullmatch(r'(\w+):(\w+)=([\d.]+)', value)
+    if match is None or match.group(1) not in STAGES or match.group(2) not in stats:
+        raise argparse.ArgumentTypeError(
+            f"Invalid budget: {value}. Expected STAGE:STAT=MS with STAGE in {STAGES} and STAT in {stats}.")
+    stage, stat, ms = match.groups()
+    return stage, stat, float(ms)
+
+
+def parse_resource_budget(value):
+    """Parse a PROCESS=LIMIT resource budget, e.g. 'dashboard=1500'."""
+    match = re.fullmatch(r'(\w+)=([\d.]+)', value)
+    if match is None or match.group(1) not in PROCESSES:
+        raise argparse.ArgumentTypeError(
+            f"Invalid resource budget: {value}. Expected PROCESS=LIMIT with PROCESS in {PROCESSES}.")
+    process, limit = match.groups()
+    return process, float(limit)
+
+
+def check_budgets(latencies, resources, budgets, max_rss_mb=(), max_cpu_percent=(), max_error_rate=0.0):
+    """
+    Compare measurements against budgets, and flag any ingestion error
+
+    :param max_rss_mb: (process, MB) budgets on peak resident memory
+    :param max_cpu_percent: (process, percent) budgets on mean CPU usage
+    :param max_error_rate: Highest tolerated share of failed calls in dashboard stages
+    :return: List of violation messages, empty if every budget holds
+    """
+    violations = []
+    for stage in INGEST_STAGES:
+        if latencies.loc[stage, 'errors'] > 0:
+            violations.append(f"{stage} had {latencies.loc[stage, 'errors']} errors")
+    if latencies.loc['session', 'count'] == 0:
+        violations.append("no dashboard session completed")
+    for stage in DASHBOARD_STAGES:
+        count, errors = latencies.loc[stage, 'count'], latencies.loc[stage, 'errors']
+        if errors and errors > max_error_rate * max(count, 1):
+            violations.append(f"{stage} had {errors} errors in {count} calls "
+                              f"(error rate > {max_error_rate:.0%})")
+    for stage, stat, limit in budgets:
+        measured = latencies.loc[stage, stat]
+        if np.isnan(measured) or measured > limit:
+            violations.append(f"{stage} {stat} = {measured:.1f} ms > {limit:.1f} ms")
+    for process, limit in max_rss_mb:
+        if resources[process]['rss_max_mb'] > limit:
+            violations.append(f"{process} max RSS = {resources[process]['rss_max_mb']:.1f} MB > {limit:.1f} MB")
+    for process, limit in max_cpu_percent:
+        if resources[process]['cpu_mean_percent'] > limit:
+            violations.append(f"{process} mean CPU = {resources[process]['cpu_mean_percent']:.1f}% "
+                              f"> {limit:.1f}%")
+    return violations
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Load test the trade -> candle -> forecast -> render path')
+    parser.add_argument('--symbols', type=int, default=1, help='Symbols ingested concurrently')
+    parser.add_argument('--trades-per-sec', type=float, default=20, help='Trades per second per symbol')
+    parser.add_argument('--sessions', type=int, default=1, help='Concurrent dashboard sessions')
+    parser.add_argument('--duration', type=float, default=60, help='Seconds of measured load')
+    parser.add_argument('--warmup', type=float, default=5, help='Seconds of ingestion before sessions start')
+    parser.add_argument('--frequency', type=float, default=0.05, help='Seconds between retrievals')
+    parser.add_argument('--limit', type=int, default=50, help='Trades fetched per retrieval')
+    parser.add_argument('--refresh-interval', type=float, default=1.0, help='Seconds between session runs')
+    parser.add_argument('--seed-candles', type=int, default=200, help='Synthetic candles written per symbol')
+    parser.add_argument('--max-rows', type=int, default=5000, help='Retention of the CSV stores')
+    parser.add_argument('--fsync-every', type=int, default=1, help='fsync every N writes (0 = never)')
+    parser.add_argument('--workdir', default=None, help='Directory for data files (default: temporary, removed)')
+    parser.add_argument('--budget', type=parse_budget, action='append', default=[],
+                        help="Latency budget as STAGE:STAT=MS, e.g. 'end_to_end:p99=2000' (repeatable)")
+    parser.add_argument('--max-rss-mb', type=parse_resource_budget, action='append', default=[],
+                        help="Peak resident memory budget as PROCESS=MB, e.g. 'ingest=300' (repeatable)")
+    parser.add_argument('--max-cpu-percent', type=parse_resource_budget, action='append', default=[],
+                        help="Mean CPU budget as PROCESS=PERCENT, e.g. 'dashboard=150' (repeatable)")
+    parser.add_argument('--max-error-rate', type=float, default=0.0,
+                        help='Highest tolerated share of failed load/forecast/render/session calls')
+    args = parser.parse_args()
+
+    # Keep per-write INFO logs of the pipeline out of the measurements
+    logging.basicConfig(level=logging.WARNING, format='%(asctime)s - %(levelname)s: %(message)s')
+
+    load_test = LoadTest(symbols=args.symbols,
+                         trades_per_sec=args.trades_per_sec,
+                         sessions=args.sessions,
+                         duration=args.duration,
+                         warmup=args.warmup,
+                         frequency=args.frequency,
+                         limit=args.limit,
+                         refresh_interval=args.refresh_interval,
+                         seed_candles=args.seed_candles,
+                         max_rows=args.max_rows,
+                         fsync_every=args.fsync_every,
+                         workdir=args.workdir)
+    latencies, resources = load_test.run()
+
+    print(f"{len(load_test.symbols)} symbols x {args.trades_per_sec:g} trades/s, "
+          f"{args.sessions} sessions, {args.duration:g}s")
+    print(latencies.round(1).to_string())
+    for process, usage in resources.items():
+        print(f"{process}: CPU mean {usage['cpu_mean_percent']:.1f}% / max {usage['cpu_max_percent']:.1f}%, "
+              f"peak RSS {usage['rss_max_mb']:.1f} MB")
+    for stage, causes in load_test.recorder.error_causes().items():
+        for cause, count in causes:
+            print(f"{stage} error x{count}: {cause}")
+
+    violations = check_budgets(latencies, resources, args.budget,
+                               max_rss_mb=args.max_rss_mb, max_cpu_percent=args.max_cpu_percent,
+                               max_error_rate=args.max_error_rate)
+    for violation in violations:
+        print(f"BUDGET EXCEEDED: {violation}")
+    sys.exit(1 if violations else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+import os
+import glob
+import tempfile
+import logging
+
+
+class CsvStore:
+    def __init__(self, fsync_every=1):
+        """
+        Crash-safe CSV writer for the raw and OHLCV stores.
+
+        Full rewrites go to a temporary file in the target directory and are
+        swapped in with an atomic rename, so readers polling the file always
+        see either the previous or the new snapshot, never a partial one, and
+        need no lock. Appends are used for the raw trades journal.
+
+        The data of a rewrite is always fsynced before its rename, so a crash can
+        never leave an empty snapshot behind. Batching only applies to the
+        directory entry of a rewrite and to journal appends, where a crash can
+        at most lose the most recent writes.
+
+        :param fsync_every: Flush writes of a path to disk every N writes. 1 is
+            the most durable, larger values trade durability for throughput, 0
+            leaves flushing entirely to the OS.
+        """
+        self.fsync_every = fsync_every
+        self._unsynced_writes = {}
+        self._touched_paths = set()
+        self.logger = logging.getLogger(__name__)
+
+    def _should_sync(self, data_path):
+        """
+        Count a write to data_path and decide whether it closes that path's fsync batch
+
+        :param data_path: Path to the CSV file
+        :return: Boolean indicating if the write must be fsynced
+        """
+        if self.fsync_every <= 0:
+            return False
+        self._unsynced_writes[data_path] = self._unsynced_writes.get(data_path, 0) + 1
+        if self._unsynced_writes[data_path] >= self.fsync_every:
+            self._unsynced_writes[data_path] = 0
+            return True
+        return False
+
+    def _temp_prefix(self, data_path):
+        return f".{os.path.basename(data_path)}."
+
+    def _remove_stale_temp_files(self, data_path):
+        """
+        Remove temp files of data_path left by a crash, the first time the path is touched
+
+        :param data_path: Path to the CSV file
+        """
+        if data_path in self._touched_paths:
+            return
+        self._touched_paths.add(data_path)
+        directory = os.path.dirname(data_path) or '.'
+        pattern = os.path.join(glob.escape(directory), glob.escape(self._temp_prefix(data_path)) + '*.tmp')
+        for tmp_path in glob.glob(pattern):
+            try:
+                os.remove(tmp_path)
+                self.logger.warning(f"Removed stale temp file {tmp_path}")
+            except OSError:
+                pass
+
+    @staticmethod
+    def _fsync_dir(directory):
+        """Persist a rename by syncing its parent directory (no-op where unsupported)."""
+        try:
+            fd = os.open(directory, os.O_RDONLY)
+        except OSError:
+            return
+        try:
+            os.fsync(fd)
+        except OSError:
+            pass
+        finally:
+            os.close(fd)
+
+    def replace(self, df, data_path):
+        """
+        Atomically replace the CSV at data_path with df
+
+        :param df: DataFrame to write
+        :param data_path: Path to the CSV file
+        """
+        directory = os.path.dirname(data_path) or '.'
+        os.makedirs(directory, exist_ok=True)
+        self._remove_stale_temp_files(data_path)
+        sync = self._should_sync(data_path)
+
+        fd, tmp_path = tempfile.mkstemp(dir=directory,
+                                        prefix=self._temp_prefix(data_path),
+                                        suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', newline='') as tmp_file:
+                df.to_csv(tmp_file, index=False)
+                # Never rename unsynced data over the previous good snapshot
+                tmp_file.flush()
+                os.fsync(tmp_file.fileno())
+            os.replace(tmp_path, data_path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+        if sync:
+            self._fsync_dir(directory)
+
+    def append(self, df, data_path):
+        """
+        Append df to the CSV journal at data_path, writing the header on creation
+
+        :param df: DataFrame to append
+        :param data_path: Path to the CSV file
+        """
+        directory = os.path.dirname(data_path) or '.'
+        os.makedirs(directory, exist_ok=True)
+        self._remove_stale_temp_files(data_path)
+        created = not os.path.exists(data_path)
+
+        # Render first so the file only ever receives one complete write
+        payload = df.to_csv(header=created, index=False)
+        with open(data_path, 'a', newline='') as journal:
+            journal.write(payload)
+            if self._should_sync(data_path):
+                journal.flush()
+                os.fsync(journal.fileno())
+
+        if created and self.fsync_every > 0:
+            self._fsync_dir(directory)
+
+    def recover_journal(self, data_path):
+        """
+        Drop a torn trailing line left by a crash mid-append and count data rows
+
+        :param data_path: Path to the CSV file
+        :return: Number of rows excluding the header, 0 if the file is missing
+        """
+        self._remove_stale_temp_files(data_path)
+        if not os.path.exists(data_path):
+            return 0
+        with open(data_path, 'rb+') as f:
+            content = f.read()
+            complete = content.rfind(b'\n') + 1
+            if complete < len(content):
+                f.truncate(complete)
+                self.logger.warning(f"Truncated {len(content) - complete} bytes of torn write from {data_path}")
+        if complete == 0:
+            # Not even the header survived; let the next append recreate it
+            os.remove(data_path)
+            return 0
+        return max(content.count(b'\n', 0, complete) - 1, 0)
@@ -0,0 +1,152 @@
+import os
+import pandas as pd
+import pytest
+
+from src.archive import ParquetArchive
+
+
+def ohlcv(start, periods, freq='6h', close=1.0):
+    windows = pd.date_range(start, periods=periods, freq=freq)
+    return pd.DataFrame({
+        'time_window': windows,
+        'open_price': close,
+        'high_price': close,
+        'low_price': close,
+        'close_price': close,
+        'volume': range(periods),
+    })
+
+
+def part_files(root, dataset='ohlcv', symbol='BTCUSDT'):
+    files = []
+    for dirpath, _, filenames in os.walk(os.path.join(root, dataset, f'symbol={symbol}')):
+        files += [os.path.join(dirpath, f) for f in filenames if f.startswith('part-')]
+    return sorted(files)
+
+
+def test_flush_partitions_by_symbol_and_date(tmp_path):
+    archive = ParquetArchive(root_path=str(tmp_path))
+    archive.append(ohlcv('2024-01-01', 8), 'ohlcv', 'BTCUSDT')
+    archive.flush()
+
+    dates = sorted(os.listdir(tmp_path / 'ohlcv' / 'symbol=BTCUSDT'))
+    assert dates == ['date=2024-01-01', 'date=2024-01-02']
+    assert len(archive.read('ohlcv', symbol='BTCUSDT')) == 8
+
+
+def test_append_flushes_on_row_and_time_bounds(tmp_path, monkeypatch):
+    archive = ParquetArchive(root_path=str(tmp_path), flush_rows=4, flush_interval=300)
+    archive.append(ohlcv('2024-01-01', 4), 'ohlcv', 'BTCUSDT')
+    assert len(part_files(tmp_path)) == 1
+
+    now = [1000.0]
+    monkeypatch.setattr('src.archive.time.monotonic', lambda: now[0])
+    archive.append(ohlcv('2024-01-03', 1), 'ohlcv', 'BTCUSDT')
+    assert len(part_files(tmp_path)) == 1
+
+    now[0] += 301
+    archive.append(ohlcv('2024-01-03 06:00', 1), 'ohlcv', 'BTCUSDT')
+    assert len(part_files(tmp_path)) == 2
+    assert archive._buffers == {}
+
+
+def test_flush_drops_duplicate_keys(tmp_path):
+    archive = ParquetArchive(root_path=str(tmp_path))
+    trades = pd.DataFrame({
+        'transaction_id': [1, 2, 2, 3],
+        'price': [1.0, 2.0, 2.0, 3.0],
+        'time': pd.to_datetime(['2024-01-01 00:00:01', '2024-01-01 00:00:02',
+                                '2024-01-01 00:00:02', '2024-01-01 00:00:03']),
+    })
+    archive.append(trades, 'trades', 'BTCUSDT')
+    archive.flush()
+
+    df = pd.read_parquet(part_files(tmp_path, 'trades')[0])
+    assert df['transaction_id'].tolist() == [1, 2, 3]
+
+
+def test_failed_flush_keeps_unwritten_rows(tmp_path, monkeypatch):
+    archive = ParquetArchive(root_path=str(tmp_path))
+    archive.append(ohlcv('2024-01-01', 8), 'ohlcv', 'BTCUSDT')
+
+    real_write_part = archive._write_part
+    def fail_on_second_day(table, partition_dir):
+        if partition_dir.endswith('date=2024-01-02'):
+            raise OSError('disk full')
+        real_write_part(table, partition_dir)
+    monkeypatch.setattr(archive, '_write_part', fail_on_second_day)
+
+    with pytest.raises(OSError):
+        archive.flush()
+    # Only the rows of the partition that failed are still buffered
+    buffered = pd.concat(archive._buffers[('ohlcv', 'BTCUSDT')])
+    assert buffered['time_window'].dt.day.unique().tolist() == [2]
+
+    monkeypatch.setattr(archive, '_write_part', real_write_part)
+    archive.flush()
+    assert len(archive.read('ohlcv', symbol='BTCUSDT')) == 8
+    assert archive._buffers == {}
+
+
+def test_read_prunes_time_range_and_columns(tmp_path):
+    archive = ParquetArchive(root_path=str(tmp_path))
+    archive.append(ohlcv('2024-01-01', 12), 'ohlcv', 'BTCUSDT')
+    archive.append(ohlcv('2024-01-01', 12, close=2.0), 'ohlcv', 'ETHUSDT')
+    archive.flush()
+
+    df = archive.read('ohlcv', symbol='BTCUSDT', start='2024-01-01 12:00', end='2024-01-02 12:00',
+                      columns=['close_price'])
+
+    assert list(df.columns) == ['time_window', 'close_price']
+    assert df['time_window'].tolist() == list(pd.date_range('2024-01-01 12:00', periods=4, freq='6h'))
+    assert (df['close_price'] == 1.0).all()
+
+
+def test_read_accepts_tz_aware_bounds(tmp_path):
+    archive = ParquetArchive(root_path=str(tmp_path))
+    archive.append(ohlcv('2024-01-01', 4), 'ohlcv', 'BTCUSDT')
+    archive.flush()
+
+    df = archive.read('ohlcv', symbol='BTCUSDT', start=pd.Timestamp('2024-01-01 07:00', tz='Europe/Paris'))
+
+    assert df['time_window'].min() == pd.Timestamp('2024-01-01 06:00')
+
+
+def test_read_missing_dataset_is_empty(tmp_path):
+    df = ParquetArchive(root_path=str(tmp_path)).read('ohlcv', symbol='BTCUSDT', columns=['volume'])
+    assert df.empty
+    assert list(df.columns) == ['time_window', 'volume']
+
+
+def test_read_dedupes_across_parts(tmp_path):
+    archive = ParquetArchive(root_path=str(tmp_path))
+    archive.append(ohlcv('2024-01-01', 2), 'ohlcv', 'BTCUSDT')
+    archive.flush()
+    archive.append(ohlcv('2024-01-01', 2, close=5.0), 'ohlcv', 'BTCUSDT')
+    archive.flush()
+
+    df = archive.read('ohlcv', symbol='BTCUSDT')
+
+    assert len(df) == 2
+
+
+def test_compact_merges_past_partitions_only(tmp_path):
+    archive = ParquetArchive(root_path=str(tmp_path))
+    for _ in range(2):
+        archive.append(ohlcv('2024-01-01', 8), 'ohlcv', 'BTCUSDT')
+        archive.flush()
+    assert len(part_files(tmp_path)) == 4
+
+    archive.compact('ohlcv', before='2024-01-02')
+
+    files = part_files(tmp_path)
+    assert [os.path.basename(os.path.dirname(f)) for f in files] == \
+        ['date=2024-01-01', 'date=2024-01-02', 'date=2024-01-02']
+    # Duplicates from the two flushes are merged away
+    assert len(pd.read_parquet(files[0])) == 4
+    assert len(archive.read('ohlcv', symbol='BTCUSDT')) == 8
+
+
+def test_invalid_dataset(tmp_path):
+    with pytest.raises(ValueError):
+        ParquetArchive(root_path=str(tmp_path)).append(ohlcv('2024-01-01', 1), 'quotes', 'BTCUSDT')
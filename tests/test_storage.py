@@ -0,0 +1,97 @@
+import os
+import pandas as pd
+
+from src.storage import CsvStore
+
+
+def test_replace_writes_snapshot_atomically(tmp_path):
+    path = str(tmp_path / 'ohlcv.csv')
+    store = CsvStore(fsync_every=3)
+
+    store.replace(pd.DataFrame({'a': [1, 2]}), path)
+    store.replace(pd.DataFrame({'a': [3]}), path)
+
+    assert pd.read_csv(path)['a'].tolist() == [3]
+    # No temp file is left next to the snapshot
+    assert os.listdir(tmp_path) == ['ohlcv.csv']
+
+
+def test_replace_keeps_previous_snapshot_on_failure(tmp_path):
+    path = str(tmp_path / 'ohlcv.csv')
+    store = CsvStore()
+    store.replace(pd.DataFrame({'a': [1]}), path)
+
+    class Broken:
+        def to_csv(self, *args, **kwargs):
+            raise RuntimeError('disk full')
+
+    try:
+        store.replace(Broken(), path)
+    except RuntimeError:
+        pass
+
+    assert pd.read_csv(path)['a'].tolist() == [1]
+    assert os.listdir(tmp_path) == ['ohlcv.csv']
+
+
+def test_append_writes_header_once(tmp_path):
+    path = str(tmp_path / 'raw.csv')
+    store = CsvStore(fsync_every=0)
+
+    store.append(pd.DataFrame({'a': [1], 'b': [2]}), path)
+    store.append(pd.DataFrame({'a': [3], 'b': [4]}), path)
+
+    assert pd.read_csv(path).values.tolist() == [[1, 2], [3, 4]]
+
+
+def test_fsync_batches_are_counted_per_path(tmp_path, monkeypatch):
+    synced = []
+    real_fsync = os.fsync
+    monkeypatch.setattr(os, 'fsync', lambda fd: (synced.append(os.readlink(f'/proc/self/fd/{fd}')),
+                                                 real_fsync(fd)))
+    raw_path = str(tmp_path / 'raw.csv')
+    store = CsvStore(fsync_every=2)
+
+    # Interleaved writes to another path must not steal the journal's syncs
+    for _ in range(4):
+        store.append(pd.DataFrame({'a': [1]}), raw_path)
+        store.replace(pd.DataFrame({'a': [1]}), str(tmp_path / 'ohlcv.csv'))
+
+    assert synced.count(raw_path) == 2
+    # Every snapshot is synced before its rename
+    assert sum(p.endswith('.tmp') for p in synced) == 4
+
+
+def test_recover_journal_trims_torn_line(tmp_path):
+    path = tmp_path / 'raw.csv'
+    path.write_text('a,b\n1,2\n3,4\n5,')
+
+    assert CsvStore().recover_journal(str(path)) == 2
+    assert path.read_text() == 'a,b\n1,2\n3,4\n'
+
+
+def test_recover_journal_removes_headerless_journal(tmp_path):
+    path = tmp_path / 'raw.csv'
+    path.write_text('a,')
+    store = CsvStore()
+
+    assert store.recover_journal(str(path)) == 0
+    assert not path.exists()
+
+    # The next append recreates the header
+    store.append(pd.DataFrame({'a': [1]}), str(path))
+    assert path.read_text() == 'a\n1\n'
+
+
+def test_recover_journal_missing_file(tmp_path):
+    assert CsvStore().recover_journal(str(tmp_path / 'raw.csv')) == 0
+
+
+def test_stale_temp_files_removed_on_first_touch(tmp_path):
+    path = str(tmp_path / 'ohlcv.csv')
+    (tmp_path / '.ohlcv.csv.abc123.tmp').write_text('partial')
+    (tmp_path / '.other.csv.abc123.tmp').write_text('partial')
+
+    CsvStore().replace(pd.DataFrame({'a': [1]}), path)
+
+    assert sorted(os.listdir(tmp_path)) == ['.other.csv.abc123.tmp', 'ohlcv.csv']